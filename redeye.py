@@ -8,19 +8,54 @@
 # =============================================================================
 # IMPORTS
 # =============================================================================
+import atexit
+import hashlib
+import io
+import ipaddress
+import json
 import os
+import re
 import shlex
 import shutil
+import socket
 import subprocess
 import sys
+import tempfile
 import textwrap
+import xml.etree.ElementTree as ET
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    # Optional: lets batch report generation compile the stylesheet once in-process.
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+try:
+    # Optional: tab completion and line editing at the prompts (absent on Windows).
+    import readline
+except ImportError:
+    readline = None
 
 # =============================================================================
 # CONSTANTS AND GLOBAL VARIABLES
 # =============================================================================
 REQUIRED = ["nmap", "ndiff", "xsltproc"]
 SESSIONS_DIR = "redeye_sessions"
+PIPE_CHUNK_SIZE = 65536  # matches the default Linux pipe capacity
+MAX_QUEUE_WORKERS = 4  # concurrent nmap processes when running the scan queue
+MAX_PARALLEL_ADDRESSES = 2 ** 24  # largest network the parallel scan will split up (a /8)
+try:
+    CACHE_TTL = int(os.environ.get("REDEYE_CACHE_TTL", "300"))  # seconds a session scan result is reused
+except ValueError:
+    print(f"[WARN] REDEYE_CACHE_TTL={os.environ['REDEYE_CACHE_TTL']!r} is not a whole number of seconds; using 300.")
+    CACHE_TTL = 300
+ASSUME_YES = os.environ.get("REDEYE_YES", "").strip().lower() in ("1", "yes", "true")  # answer every confirmation with yes
+MASSCAN_RATE = 10000  # packets/s for the masscan pre-filter of full port scans
 
 # =============================================================================
 # UTILITY FUNCTIONS
@@ -28,8 +63,10 @@ SESSIONS_DIR = "redeye_sessions"
 
 def run_cmd(cmd, capture=False):
     """Run command (list or string). Return (returncode, stdout, stderr)."""
-    if isinstance(cmd, str):
-        cmd = shlex.split(cmd)
+    return _run_cmd_list(shlex.split(cmd) if isinstance(cmd, str) else cmd, capture)
+
+def _run_cmd_list(cmd, capture=False):
+    """Run an argv list. Return (returncode, stdout, stderr)."""
     try:
         if capture:
             proc = subprocess.run(cmd, check=False, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
@@ -42,9 +79,14 @@ def run_cmd(cmd, capture=False):
     except Exception as e:
         return 1, "", str(e)
 
+@lru_cache(maxsize=None)
+def _which_cached(name, path):
+    """Memoized shutil.which lookup; cleared after a successful install."""
+    return shutil.which(name, path=path)
+
 def shutil_which(name):
-    """Simple wrapper for shutil.which but avoids import collision if needed."""
-    return shutil.which(name)
+    """Cached wrapper for shutil.which, keyed on the current PATH."""
+    return _which_cached(name, os.environ.get("PATH"))
 
 def is_root():
     """Check if running as root user."""
@@ -54,97 +96,114 @@ def is_root():
         # Windows or other, assume not root
         return False
 
+_ANSI_RE = re.compile(r'(\x1b\[[0-9;]*m)')
+
+def ask(prompt, completer=None):
+    """
+    input() that keeps readline's cursor maths right for colored prompts:
+    escape codes are wrapped in \\001/\\002 so they count as zero width.
+    `completer` is offered for tab completion on this prompt only.
+    """
+    if readline is None or not sys.stdin.isatty():
+        return input(prompt)
+    readline.set_completer(completer)
+    try:
+        return input(_ANSI_RE.sub('\001\\1\002', prompt))
+    finally:
+        readline.set_completer(None)
+
+def _confirm(prompt, accept=('y', 'yes')):
+    """Asks a yes/no question; always yes when REDEYE_YES is set."""
+    if ASSUME_YES:
+        print(f"{prompt}yes (REDEYE_YES)")
+        return True
+    return ask(prompt).strip().lower() in accept
+
 # =============================================================================
 # DEPENDENCY MANAGEMENT FUNCTIONS
 # =============================================================================
 
+# os-release ID / ID_LIKE token -> (os_id, package manager)
+OS_RELEASE_IDS = {
+    "ubuntu": ("ubuntu", "apt"),
+    "debian": ("debian", "apt"),
+    "arch": ("arch", "pacman"),
+    "fedora": ("redhat", "dnf"),
+    "rhel": ("redhat", "dnf"),
+    "centos": ("redhat", "dnf"),
+}
+
+# package manager -> (install_cmd, update_cmd)
+PKG_COMMANDS = {
+    "apt": (["apt-get", "install", "-y"], ["apt-get", "update", "-y"]),
+    "pacman": (["pacman", "-S", "--noconfirm"], ["pacman", "-Sy", "--noconfirm"]),
+    "dnf": (["dnf", "install", "-y"], ["dnf", "makecache", "--refresh", "-y"]),
+    "yum": (["yum", "install", "-y"], ["yum", "makecache", "-y"]),
+    "pkg": (["pkg", "install", "-y"], ["pkg", "update", "-y"]),
+}
+
+# fallback probe order: (binary, package manager, os_id)
+PKG_BINARIES = (
+    ("apt-get", "apt", "debian-like"),
+    ("pacman", "pacman", "arch"),
+    ("dnf", "dnf", "redhat"),
+    ("yum", "yum", "redhat"),
+    ("pkg", "pkg", "termux"),
+)
+
+def read_os_release(path="/etc/os-release"):
+    """Parse an os-release file into a dict of KEY -> unquoted value."""
+    info = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            key, sep, value = line.strip().partition("=")
+            if sep and not key.startswith("#"):
+                info[key] = value.strip("\"'")
+    return info
+
 def detect_os():
     """Return tuple (os_id, pkg_manager, install_cmd_list, update_cmd_list)."""
     # default unknown
     os_id = "unknown"
     pkg = None
-    install_cmd = None
-    update_cmd = None
 
     # termux detection
     if os.environ.get("PREFIX", "").startswith("/data/data/com.termux/files/usr") or os.path.exists("/data/data/com.termux/files/usr"):
         os_id = "termux"
         pkg = "pkg"
-        install_cmd = ["pkg", "install", "-y"]
-        update_cmd = ["pkg", "update", "-y"]
-        return os_id, pkg, install_cmd, update_cmd
 
-    # read /etc/os-release if exists
-    if os.path.exists("/etc/os-release"):
+    # read /etc/os-release if exists: ID first, then ID_LIKE tokens
+    elif os.path.exists("/etc/os-release"):
         try:
-            with open("/etc/os-release", "r", encoding="utf-8") as f:
-                data = f.read().lower()
-            # simple matching
-            if "ubuntu" in data:
-                os_id = "ubuntu"
-                pkg = "apt"
-                install_cmd = ["apt-get", "install", "-y"]
-                update_cmd = ["apt-get", "update", "-y"]
-            elif "debian" in data and "ubuntu" not in data:
-                os_id = "debian"
-                pkg = "apt"
-                install_cmd = ["apt-get", "install", "-y"]
-                update_cmd = ["apt-get", "update", "-y"]
-            elif "arch" in data:
-                os_id = "arch"
-                pkg = "pacman"
-                install_cmd = ["pacman", "-S", "--noconfirm"]
-                update_cmd = ["pacman", "-Sy", "--noconfirm"]
-            elif any(x in data for x in ("fedora", "rhel", "centos", "red hat")):
-                os_id = "redhat"
+            info = read_os_release()
+            entry = OS_RELEASE_IDS.get(info.get("ID", "").lower())
+            if entry is None:
+                for token in info.get("ID_LIKE", "").lower().split():
+                    entry = OS_RELEASE_IDS.get(token)
+                    if entry is not None:
+                        if token == "debian":
+                            entry = ("debian-like", "apt")
+                        break
+            if entry is not None:
+                os_id, pkg = entry
                 # prefer dnf when available
-                if shutil_which("dnf"):
-                    pkg = "dnf"
-                    install_cmd = ["dnf", "install", "-y"]
-                    update_cmd = ["dnf", "makecache", "--refresh", "-y"]
-                else:
+                if pkg == "dnf" and not shutil_which("dnf"):
                     pkg = "yum"
-                    install_cmd = ["yum", "install", "-y"]
-                    update_cmd = ["yum", "makecache", "-y"]
-            else:
-                # try ID_LIKE fallback
-                if "id_like=debian" in data or "id_like=debian" in data.replace('"', ''):
-                    os_id = "debian-like"
-                    pkg = "apt"
-                    install_cmd = ["apt-get", "install", "-y"]
-                    update_cmd = ["apt-get", "update", "-y"]
         except Exception:
             pass
 
     # fallback: detect package manager binaries
     if pkg is None:
-        if shutil_which("apt-get"):
-            os_id = os_id if os_id != "unknown" else "debian-like"
-            pkg = "apt"
-            install_cmd = ["apt-get", "install", "-y"]
-            update_cmd = ["apt-get", "update", "-y"]
-        elif shutil_which("pacman"):
-            os_id = "arch"
-            pkg = "pacman"
-            install_cmd = ["pacman", "-S", "--noconfirm"]
-            update_cmd = ["pacman", "-Sy", "--noconfirm"]
-        elif shutil_which("dnf"):
-            os_id = "redhat"
-            pkg = "dnf"
-            install_cmd = ["dnf", "install", "-y"]
-            update_cmd = ["dnf", "makecache", "--refresh", "-y"]
-        elif shutil_which("yum"):
-            os_id = "redhat"
-            pkg = "yum"
-            install_cmd = ["yum", "install", "-y"]
-            update_cmd = ["yum", "makecache", "-y"]
-        elif shutil_which("pkg"):
-            os_id = "termux"
-            pkg = "pkg"
-            install_cmd = ["pkg", "install", "-y"]
-            update_cmd = ["pkg", "update", "-y"]
-
-    return os_id, pkg, install_cmd, update_cmd
+        for binary, manager, fallback_id in PKG_BINARIES:
+            if shutil_which(binary):
+                os_id = fallback_id
+                pkg = manager
+                break
+
+    if pkg is None:
+        return os_id, None, None, None
+    install_cmd, update_cmd = PKG_COMMANDS[pkg]
+    return os_id, pkg, list(install_cmd), list(update_cmd)
 
 def check_tools():
     """Check which required tools are available."""
@@ -160,9 +219,11 @@ def check_tools():
 def pkg_name_for_bin(bin_name, pkg_manager):
     """Map binary to package name per package manager."""
     # default identity
-    if pkg_manager in ("apt", "pkg"):
+    if pkg_manager == "apt":
+        return bin_name  # Debian/Ubuntu ship ndiff as its own package
+    if pkg_manager == "pkg":
         if bin_name == "ndiff":
-            return "nmap"  # ndiff often included with nmap on Debian/Ubuntu
+            return "nmap"
         return bin_name
     if pkg_manager == "pacman":
         if bin_name == "xsltproc":
@@ -179,19 +240,19 @@ def pkg_name_for_bin(bin_name, pkg_manager):
     # fallback
     return bin_name
 
-def attempt_install(missing, pkg_manager, install_cmd, update_cmd):
-    """Try to update db and install missing packages. Return True if all installed."""
+# package managers whose database was already refreshed in this process
+_DB_UPDATED = set()
+
+def attempt_install(missing, pkg_manager, install_cmd, update_cmd, interactive=False):
+    """Try to update db and install missing packages. Return True if all installed.
+
+    With `interactive`, the user confirms the whole package list once and the
+    package manager's output is streamed to the terminal instead of captured.
+    """
     if pkg_manager is None or install_cmd is None:
         print("[ERROR] No supported package manager detected; cannot install automatically.")
         return False
 
-    # update if possible
-    if update_cmd:
-        print(f"[INFO] Running update: {' '.join(update_cmd)}")
-        rc, out, err = run_cmd(update_cmd, capture=True)
-        if rc != 0:
-            print(f"[WARN] Update command returned {rc}. stdout: {out} stderr: {err}")
-
     pkg_names = []
     for b in missing:
         pkg_names.append(pkg_name_for_bin(b, pkg_manager))
@@ -204,33 +265,61 @@ def attempt_install(missing, pkg_manager, install_cmd, update_cmd):
             seen.add(p)
             uniq.append(p)
 
+    if interactive:
+        if not _confirm(f"{Colors.YELLOW}Attempt to install {', '.join(uniq)} using {pkg_manager}? (y/n): {Colors.ENDC}"):
+            print(f"{Colors.RED}Installation skipped by user.{Colors.ENDC}")
+            return False
+
+    # update if possible, at most once per package manager per run
+    updated = not update_cmd or pkg_manager in _DB_UPDATED
+    if not updated:
+        print(f"[INFO] Running update: {' '.join(update_cmd)}")
+        rc, out, err = _run_cmd_list(update_cmd, capture=not interactive)
+        updated = rc == 0
+        if updated:
+            _DB_UPDATED.add(pkg_manager)
+        else:
+            print(f"[WARN] Update command returned {rc}. stdout: {out} stderr: {err}")
+
     cmd = install_cmd + uniq
     print(f"[INFO] Trying install: {' '.join(cmd)} (without sudo)")
 
-    rc, out, err = run_cmd(cmd, capture=True)
-    if rc == 0:
-        print("[INFO] Install command finished, re-checking tools...")
-    else:
-        print(f"[WARN] Install without sudo returned {rc}. stderr: {err}")
-
-    # re-check
+    rc, out, err = _run_cmd_list(cmd, capture=not interactive)
+    # PATH contents changed either way; drop stale which() results.
+    _which_cached.cache_clear()
+    # one re-check for the whole batch: a zero exit only means the packages
+    # installed, and a failed transaction may still have installed some
     _, still_missing = check_tools()
     if not still_missing:
         print("[INFO] All tools installed successfully.")
         return True
+    if rc == 0:
+        print(f"[ERROR] Install succeeded but still missing: {', '.join(still_missing)}")
+        return False
+    print(f"[WARN] Install without sudo returned {rc}. stderr: {err}")
 
     # try with sudo if not root
     if not is_root():
+        # the unprivileged update most likely failed too; without it a fresh
+        # host has no package lists and the install cannot find anything
+        if not updated:
+            sudo_update = ["sudo"] + update_cmd
+            print(f"[INFO] Running update with sudo: {' '.join(sudo_update)}")
+            rc, out, err = _run_cmd_list(sudo_update, capture=not interactive)
+            if rc == 0:
+                _DB_UPDATED.add(pkg_manager)
+            else:
+                print(f"[WARN] sudo update returned {rc}. stdout: {out} stderr: {err}")
         sudo_cmd = ["sudo"] + cmd
         print(f"[INFO] Retrying with sudo: {' '.join(sudo_cmd)}")
-        rc, out, err = run_cmd(sudo_cmd, capture=True)
+        rc, out, err = _run_cmd_list(sudo_cmd, capture=not interactive)
+        _which_cached.cache_clear()
+        _, still_missing = check_tools()
+        if not still_missing:
+            print("[INFO] All tools installed successfully (with sudo).")
+            return True
         if rc == 0:
-            _, still_missing = check_tools()
-            if not still_missing:
-                print("[INFO] All tools installed successfully (with sudo).")
-                return True
-            else:
-                print(f"[WARN] Still missing after sudo install: {still_missing}")
+            print(f"[ERROR] sudo install succeeded but still missing: {', '.join(still_missing)}")
         else:
             print(f"[ERROR] sudo install failed with rc={rc}. stderr: {err}")
 
@@ -266,8 +355,11 @@ def print_manual_suggestions(pkg_manager):
         print("Unknown package manager. Try installing: nmap, libxslt (xsltproc).")
     print("If you are inside a container or don't have privileges, consider contacting the sysadmin or using a container that has these tools.")
 
-def ensure_tools():
-    """Main entry: detect OS, check and attempt install, print suggestions on failure."""
+def ensure_tools(interactive=False):
+    """Main entry: detect OS, check and attempt install, print suggestions on failure.
+
+    `interactive` asks for confirmation before installing.
+    """
     print("[INFO] Checking required tools:", ", ".join(REQUIRED))
     found, missing = check_tools()
     if not missing:
@@ -278,7 +370,7 @@ def ensure_tools():
     os_id, pkg_manager, install_cmd, update_cmd = detect_os()
     print(f"[INFO] Detected OS: {os_id}, package manager: {pkg_manager}")
 
-    ok = attempt_install(missing, pkg_manager, install_cmd, update_cmd)
+    ok = attempt_install(missing, pkg_manager, install_cmd, update_cmd, interactive)
     if ok:
         return True
 
@@ -306,9 +398,13 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
-def show_banner():
-    """Displays the RedEye ASCII art banner."""
-    logo = r"""
+# Drop escape codes when output is piped or NO_COLOR is set. This must run
+# before any of the pre-formatted UI strings below are built.
+if os.environ.get("NO_COLOR") or not sys.stdout.isatty():
+    for _name in [n for n in vars(Colors) if not n.startswith('_')]:
+        setattr(Colors, _name, '')
+
+LOGO = r"""
 ░▒▓███████▓▒░░▒▓████████▓▒░▒▓███████▓▒░░▒▓████████▓▒░▒▓█▓▒░░▒▓█▓▒░▒▓████████▓▒░
 ░▒▓█▓▒░░▒▓█▓▒░▒▓█▓▒░     ░▒▓█▓▒░░▒▓█▓▒░▒▓█▓▒░     ░▒▓█▓▒░░▒▓█▓▒░▒▓█▓▒░
 ░▒▓█▓▒░░▒▓█▓▒░▒▓█▓▒░     ░▒▓█▓▒░░▒▓█▓▒░▒▓█▓▒░     ░▒▓█▓▒░░▒▓█▓▒░▒▓█▓▒░
@@ -317,131 +413,599 @@ def show_banner():
 ░▒▓█▓▒░░▒▓█▓▒░▒▓█▓▒░     ░▒▓█▓▒░░▒▓█▓▒░▒▓█▓▒░         ░▒▓█▓▒░   ░▒▓█▓▒░
 ░▒▓█▓▒░░▒▓█▓▒░▒▓████████▓▒░▒▓███████▓▒░░▒▓████████▓▒░  ░▒▓█▓▒░   ░▒▓████████▓▒░
 """
-    print(f"{Colors.RED}{logo}{Colors.ENDC}")
-    print(f"{Colors.BOLD}            Welcome to the RedEye Nmap Scanner - Professional Edition{Colors.ENDC}\n")
+
+# Static UI strings, formatted once at import.
+BANNER = (f"{Colors.RED}{LOGO}{Colors.ENDC}\n"
+          f"{Colors.BOLD}            Welcome to the RedEye Nmap Scanner - Professional Edition{Colors.ENDC}\n")
+_WRAPPER = textwrap.TextWrapper(width=80)
+
+def show_banner():
+    """Displays the RedEye ASCII art banner."""
+    print(BANNER)
 
 def print_wrapped(text, indent=0):
     """Prints text with wrapping and indentation."""
-    prefix = ' ' * indent
-    wrapper = textwrap.TextWrapper(initial_indent=prefix, width=80, subsequent_indent=prefix)
-    print(wrapper.fill(text))
-
-def check_tool_installed(tool_name):
-    """Checks if a given tool is installed and available in the PATH using shutil.which."""
-    print(f"{Colors.YELLOW}Checking for {tool_name} installation...{Colors.ENDC}", end=' ')
-    path = shutil.which(tool_name)
-    if path:
-        print(f"{Colors.GREEN}Found at {path}{Colors.ENDC}")
+    _WRAPPER.initial_indent = _WRAPPER.subsequent_indent = ' ' * indent
+    print(_WRAPPER.fill(text))
+
+# =============================================================================
+# SCANNING AND COMMAND EXECUTION FUNCTIONS
+# =============================================================================
+
+# Long-lived shell reused for helper commands (ndiff) so each run skips a fork/exec from Python.
+_WORKER_SENTINEL = b"__REDEYE_DONE__"
+_worker = None
+
+def _stop_worker():
+    """Closes the persistent shell, if one was started."""
+    global _worker
+    if _worker is not None and _worker.poll() is None:
+        try:
+            _worker.stdin.close()
+            _worker.wait(timeout=5)
+        except Exception:
+            _worker.kill()
+    _worker = None
+
+def _get_worker():
+    """Returns the persistent shell, starting it on first use."""
+    global _worker
+    if _worker is None or _worker.poll() is not None:
+        _worker = subprocess.Popen(["bash"], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT, bufsize=PIPE_CHUNK_SIZE)
+    return _worker
+
+atexit.register(_stop_worker)
+
+def run_in_worker(command):
+    """Runs a command in the persistent shell, streaming its output. Returns the exit status."""
+    worker = _get_worker()
+    line = " ".join(shlex.quote(arg) for arg in command)
+    worker.stdin.write(f"{line} </dev/null; printf '%s %d\\n' {_WORKER_SENTINEL.decode()} $?\n".encode())
+    worker.stdin.flush()
+
+    fd = worker.stdout.fileno()
+    out = sys.stdout.buffer
+    sys.stdout.flush()
+    pending = b""
+    while True:
+        chunk = os.read(fd, PIPE_CHUNK_SIZE)
+        if not chunk:
+            # shell died; flush what we have and let the next call restart it
+            out.write(pending)
+            out.flush()
+            return 1
+        pending += chunk
+        idx = pending.find(_WORKER_SENTINEL)
+        if idx != -1:
+            if pending.endswith(b"\n"):
+                out.write(pending[:idx])
+                out.flush()
+                return int(pending[idx + len(_WORKER_SENTINEL):])
+            continue
+        # hold back a possible partial sentinel at the end of the buffer
+        safe = max(0, len(pending) - len(_WORKER_SENTINEL) + 1)
+        out.write(pending[:safe])
+        out.flush()
+        pending = pending[safe:]
+
+# a comma piece that only continues an nmap octet list, e.g. the "7.1" of 192.168.3-5,7.1
+_OCTET_FRAGMENT_RE = re.compile(r'[\d*-]+(?:\.[\d*-]+){0,2}')
+
+def parse_targets(raw):
+    """
+    Turns user input (comma/space separated hosts, or a file path) into a
+    target list. Commas inside an nmap octet list such as 192.168.3-5,7.1
+    stay part of that target.
+    """
+    raw = raw.strip()
+    if raw and os.path.isfile(raw):
+        with open(raw, "r", encoding="utf-8") as f:
+            raw = " ".join(line.split('#', 1)[0] for line in f)
+    targets = []
+    for word in raw.split():
+        pieces = [p for p in word.split(',') if p]
+        for i, piece in enumerate(pieces):
+            if i and _OCTET_FRAGMENT_RE.fullmatch(piece):
+                targets[-1] += ',' + piece
+            else:
+                targets.append(piece)
+    return targets
+
+# nmap octet-range targets such as 10.0.0.1-20, 10.0.*.1, 192.168.3-5,7.1 or 10.0.0.-/24
+_OCTET_ITEM = r'(?:\*|\d{0,3}-\d{0,3}|\d{1,3})'
+_OCTET = rf'{_OCTET_ITEM}(?:,{_OCTET_ITEM})*'
+_OCTET_RANGE_RE = re.compile(rf'{_OCTET}(?:\.{_OCTET}){{3}}(?:/\d{{1,2}})?')
+_HOSTNAME_RE = re.compile(r'(?=[^/]{1,253}(?:/|$))[A-Za-z0-9_](?:[A-Za-z0-9_-]{0,61}[A-Za-z0-9_])?'
+                          r'(?:\.[A-Za-z0-9_](?:[A-Za-z0-9_-]{0,61}[A-Za-z0-9_])?)*\.?(?:/\d{1,3})?')
+
+@lru_cache(maxsize=1024)
+def valid_target(target):
+    """True if nmap can take `target`: an address, network, octet range or hostname."""
+    try:
+        ipaddress.ip_network(target, strict=False)
         return True
-    else:
-        print(f"{Colors.RED}Not found.{Colors.ENDC}")
+    except ValueError:
+        pass
+    # ranges and hostnames take an IPv4 prefix length
+    _, has_mask, mask = target.partition('/')
+    if has_mask and not (mask.isdigit() and int(mask) <= 32):
         return False
+    if _OCTET_RANGE_RE.fullmatch(target):
+        return all(int(n) <= 255 for n in re.findall(r'\d+', target.split('/')[0]))
+    try:
+        ascii_name = target.encode('idna').decode('ascii')
+    except UnicodeError:
+        return False
+    # no TLD is numeric: names like 5, 7.1 or 10.0.0 are inet_aton shorthand
+    # for unrelated addresses, or fragments of a mistyped range
+    last_label = ascii_name.split('/')[0].rstrip('.').rsplit('.', 1)[-1]
+    if re.fullmatch(r'[\d-]+', last_label):
+        return False
+    return bool(_HOSTNAME_RE.fullmatch(ascii_name))
 
-def install_dependency(tool_name):
-    """Attempts to install a missing dependency using the system's package manager."""
-    manager = None
-    install_cmd = []
-    update_cmd = []
-    
-    if shutil.which("apt-get"):
-        manager = "apt-get"
-        # On Debian-based systems, ndiff is part of the nmap package.
-        package_map = {'nmap': 'nmap', 'ndiff': 'ndiff', 'xsltproc': 'xsltproc'}
-        package_name = package_map.get(tool_name)
-        update_cmd = ['sudo', 'apt-get', 'update']
-        install_cmd = ['sudo', 'apt-get', 'install', '-y', package_name]
-    elif shutil.which("dnf") or shutil.which("yum"):
-        manager = "dnf" if shutil.which("dnf") else "yum"
-        # On RedHat-based systems, ndiff is also in the nmap package, but xsltproc is in libxslt.
-        package_map = {'nmap': 'nmap', 'ndiff': 'ndiff', 'xsltproc': 'libxslt'}
-        package_name = package_map.get(tool_name)
-        install_cmd = ['sudo', manager, 'install', '-y', package_name]
+# one item of nmap's -p list: optional protocol prefix, then a port, range or service name
+_PORT_ITEM_RE = re.compile(r'(?:[TUSP]:)?(?:\d*-\d*|\d+|[A-Za-z*?][\w*?.-]*)')
+
+def normalize_ports(raw):
+    """Returns `raw` as a compact nmap port list (e.g. 'T:22,80-90'), or None if it is malformed."""
+    items = [item.strip() for item in raw.split(',')]
+    if not all(items):
+        return None
+    for item in items:
+        if not _PORT_ITEM_RE.fullmatch(item) or any(int(n) > 65535 for n in re.findall(r'\d+', item)):
+            return None
+    return ','.join(items)
+
+def _resolve(host):
+    """Returns the set of IP addresses `host` resolves to (empty if it does not)."""
+    try:
+        return {info[4][0] for info in socket.getaddrinfo(host, None)}
+    except (socket.gaierror, UnicodeError):
+        return set()
+
+def normalize_targets(targets):
+    """
+    Resolves hostnames concurrently and drops targets that point at an IP
+    already covered. Returns (targets, aliases) where aliases maps each
+    scanned target to the other inputs it absorbed. Networks and ranges
+    are passed through untouched.
+    """
+    names, literals = [], 0
+    for t in targets:
+        try:
+            ipaddress.ip_network(t, strict=False)
+            literals += 1
+        except ValueError:
+            # octet ranges and name/mask blocks are passed through unresolved
+            if not _OCTET_RANGE_RE.fullmatch(t) and '/' not in t:
+                names.append(t)
+    if len(names) > 1:
+        with ThreadPoolExecutor(max_workers=min(32, len(names))) as pool:
+            resolved = dict(zip(names, pool.map(_resolve, names)))
+    elif names and literals:
+        resolved = {names[0]: _resolve(names[0])}
     else:
-        print(f"{Colors.RED}Unsupported package manager. Please install '{tool_name}' manually.{Colors.ENDC}")
-        return False
+        # a lone hostname cannot collide with anything; skip the DNS round trip
+        resolved = {}
 
-    if not package_name:
-        print(f"{Colors.RED}Could not determine package for '{tool_name}'. Please install manually.{Colors.ENDC}")
-        return False
-        
-    choice = input(f"{Colors.YELLOW}Attempt to install '{package_name}' using {manager}? (y/n): {Colors.ENDC}").lower()
-    if choice not in ['y', 'yes']:
-        print(f"{Colors.RED}Installation skipped by user.{Colors.ENDC}")
-        return False
+    kept, aliases, owner = [], {}, {}
+    for t in targets:
+        try:
+            ips = {str(ipaddress.ip_address(t))}
+        except ValueError:
+            ips = resolved.get(t, set())
+        covered = [owner[ip] for ip in ips if ip in owner]
+        if ips and len(covered) == len(ips):
+            # every address is already being scanned
+            aliases.setdefault(covered[0], []).append(t)
+            continue
+        if t in kept:
+            continue
+        kept.append(t)
+        for ip in ips:
+            owner.setdefault(ip, t)
+    return kept, aliases
+
+@lru_cache(maxsize=None)
+def nmap_version():
+    """Returns the installed nmap version as a tuple, e.g. (7, 94), or () if unknown."""
+    rc, out, _ = _run_cmd_list(['nmap', '-V'], capture=True)
+    found = re.search(r"Nmap version (\d+)\.(\d+)", out) if rc == 0 else None
+    return tuple(int(x) for x in found.groups()) if found else ()
+
+def warm_nse_cache():
+    """
+    Starts `nmap --script-help default` in the background so the NSE script
+    database and Lua sources are in the page cache before the first script
+    scan. Does not wait for it to finish.
+    """
+    try:
+        subprocess.Popen(['nmap', '--script-help', 'default'], stdin=subprocess.DEVNULL,
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except OSError:
+        pass
+
+def target_args(targets):
+    """
+    Returns the nmap arguments selecting `targets` plus the bytes to feed on
+    stdin: one host goes on the command line, a list is read via `-iL -`.
+    """
+    if len(targets) == 1:
+        return [targets[0]], None
+    return ['-iL', '-'], ("\n".join(targets) + "\n").encode()
+
+# output options whose file names change per run and must not affect the cache key
+_VOLATILE_OPTS = {'-oN', '-oX', '-oG', '-oS', '-oA'}
+
+def _cache_key(command, stdin_data=None):
+    """Hashes a scan command (minus output options) and its stdin target list."""
+    tokens = []
+    skip = False
+    for arg in command:
+        if skip:
+            skip = False
+        elif arg in _VOLATILE_OPTS:
+            skip = True
+        else:
+            tokens.append(arg.encode())
+    if stdin_data:
+        tokens.append(stdin_data)
+    return hashlib.blake2b(b'\0'.join(tokens), digest_size=16).hexdigest()
 
+def _cached_result(cache_base):
+    """Returns the cached normal output for `cache_base` if younger than CACHE_TTL, else None."""
     try:
-        if update_cmd:
-            print(f"\n{Colors.CYAN}Running package list update ({' '.join(update_cmd)})...{Colors.ENDC}")
-            # Stream output directly to the user's terminal
-            subprocess.run(update_cmd, check=True, stdout=sys.stdout, stderr=sys.stderr)
+        if datetime.now().timestamp() - os.stat(cache_base + '.xml').st_mtime > CACHE_TTL:
+            return None
+        with open(cache_base + '.nmap', "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return None
 
-        print(f"\n{Colors.CYAN}Running installation ({' '.join(install_cmd)})...{Colors.ENDC}")
-        subprocess.run(install_cmd, check=True, stdout=sys.stdout, stderr=sys.stderr)
-        
-        print(f"{Colors.GREEN}\nInstallation of {package_name} appears to be successful.{Colors.ENDC}")
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError) as e:
-        print(f"\n{Colors.RED}Installation failed for {package_name}.{Colors.ENDC}")
-        print(f"{Colors.RED}Error: {e}{Colors.ENDC}")
-        print(f"{Colors.YELLOW}Please try installing it manually.{Colors.ENDC}")
-        return False
+def _store_result(base_filename, cache_base):
+    """Copies a finished scan's .nmap/.xml files into the session cache."""
+    os.makedirs(os.path.dirname(cache_base), exist_ok=True)
+    for ext in ('.nmap', '.xml'):
+        shutil.copyfile(base_filename + ext, cache_base + ext)
 
-def setup_environment():
-    """Checks for all dependencies and prompts to install them if missing."""
-    print(f"{Colors.BOLD}--- Checking Dependencies ---{Colors.ENDC}")
-    # ndiff is part of the nmap package, but we check for the executable to be sure.
-    dependencies = ['nmap', 'ndiff', 'xsltproc']
-    all_deps_met = True
-    
-    for tool in dependencies:
-        if not check_tool_installed(tool):
-            if not install_dependency(tool):
-                all_deps_met = False
-            # Re-check after install attempt to be certain
-            elif not check_tool_installed(tool):
-                print(f"{Colors.RED}Verification failed for {tool} after installation attempt.{Colors.ENDC}")
-                all_deps_met = False
-    
-    if not all_deps_met:
-        print(f"\n{Colors.RED}{Colors.BOLD}One or more dependencies could not be installed. Please install them manually and restart the script.{Colors.ENDC}")
-        sys.exit(1)
-    
-    print(f"{Colors.GREEN}{Colors.BOLD}All dependencies are met. Starting RedEye...{Colors.ENDC}\n")
+def _unique_scan_base(session):
+    """
+    Returns a scan_<timestamp> base path in the session that no other scan
+    uses, reserving it so concurrent scans started in the same second differ.
+    """
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    base = os.path.join(SESSIONS_DIR, session, f"scan_{timestamp}")
+    candidate, n = base, 1
+    while True:
+        try:
+            os.close(os.open(candidate + '.xml', os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return candidate
+        except FileExistsError:
+            n += 1
+            candidate = f"{base}_{n}"
 
-# =============================================================================
-# SCANNING AND COMMAND EXECUTION FUNCTIONS
-# =============================================================================
+def _discard_empty_scan(base_filename):
+    """
+    Removes the files of a scan that wrote nothing, such as the reserved .xml
+    when nmap failed to start. Returns True if the scan was empty.
+    """
+    try:
+        if os.path.getsize(base_filename + '.xml') > 0:
+            return False
+    except OSError:
+        pass
+    for ext in ('.xml', '.nmap'):
+        try:
+            if os.path.getsize(base_filename + ext) == 0:
+                os.remove(base_filename + ext)
+        except OSError:
+            pass
+    return True
+
+def _masscan_targets(targets):
+    """Returns `targets` as addresses/networks masscan accepts, or None if one cannot be mapped."""
+    out = []
+    for t in targets:
+        try:
+            ipaddress.ip_network(t, strict=False)
+            out.append(t)
+            continue
+        except ValueError:
+            pass
+        addrs = sorted(a for a in _resolve(t) if ':' not in a)
+        if not addrs:
+            return None
+        out.extend(addrs)
+    return out
+
+def _fast_port_discovery(targets, session=None):
+    """
+    Finds the open TCP ports on `targets` with masscan and returns them as a
+    comma list for nmap's -p, or None when masscan is unavailable, cannot
+    handle a target or finds nothing. Results are cached in the session.
+    """
+    if not shutil_which('masscan'):
+        return None
+    addrs = _masscan_targets(targets)
+    if not addrs:
+        return None
+    cache_file = None
+    if session:
+        cache_file = os.path.join(SESSIONS_DIR, session, "cache", "masscan_" + _cache_key(sorted(addrs)) + ".txt")
+        try:
+            if datetime.now().timestamp() - os.stat(cache_file).st_mtime <= CACHE_TTL:
+                with open(cache_file, "r", encoding="utf-8") as f:
+                    return f.read().strip() or None
+        except OSError:
+            pass
 
-def run_command(command, session=None):
+    command = ['masscan', *addrs, '-p1-65535', '--rate', str(MASSCAN_RATE), '-oL', '-']
+    if not is_root():
+        command.insert(0, 'sudo')
+    print(f"{Colors.CYAN}Pre-filtering ports with masscan: {' '.join(command)}{Colors.ENDC}")
+    ports = set()
+    try:
+        # -oL lines look like "open tcp 80 10.0.0.1 1700000000"
+        with subprocess.Popen(command, stdout=subprocess.PIPE, text=True) as proc:
+            for line in proc.stdout:
+                fields = line.split()
+                if len(fields) >= 3 and fields[0] == 'open' and fields[1] == 'tcp':
+                    ports.add(int(fields[2]))
+    except OSError as e:
+        print(f"{Colors.YELLOW}masscan failed ({e}); falling back to nmap's own port scan.{Colors.ENDC}")
+        return None
+    if proc.returncode != 0:
+        print(f"{Colors.YELLOW}masscan exited with code {proc.returncode}; falling back to nmap's own port scan.{Colors.ENDC}")
+        return None
+
+    port_list = ",".join(map(str, sorted(ports)))
+    if cache_file:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        with open(cache_file, "w", encoding="utf-8") as f:
+            f.write(port_list)
+    if not port_list:
+        print(f"{Colors.YELLOW}masscan found no open ports; nmap will scan all ports itself.{Colors.ENDC}")
+        return None
+    print(f"{Colors.GREEN}masscan found {len(ports)} open port(s): {port_list}{Colors.ENDC}")
+    return port_list
+
+def run_command(command, session=None, persistent=False, targets=None):
     """
     Executes a given shell command, saves output if a session is active,
-    and streams its output to the console.
+    and streams its output to the console. With `persistent`, the command
+    runs in the long-lived worker shell instead of a fresh process when bash
+    is available, and directly otherwise. `targets`
+    are appended so that a whole list is scanned by a single nmap process.
     """
+    stdin_data = None
+    if targets:
+        extra, stdin_data = target_args(targets)
+        if len(targets) > 1 and 'nmap' in command and nmap_version() >= (7, 90):
+            # let nmap skip addresses that several targets resolve to
+            extra = ['--unique', *extra]
+        command = [*command, *extra]
+
     is_nmap_scan = command[0] == 'nmap' and '-sn' not in command and '-sL' not in command
 
     if session and is_nmap_scan:
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        session_path = os.path.join(SESSIONS_DIR, session)
-        base_filename = os.path.join(session_path, f"scan_{timestamp}")
-        
-        command.extend(['-oN', f'{base_filename}.nmap'])
-        command.extend(['-oX', f'{base_filename}.xml'])
+        cache_base = os.path.join(SESSIONS_DIR, session, "cache", _cache_key(command, stdin_data))
+        cached = _cached_result(cache_base)
+        if cached is not None:
+            print(f"\n{Colors.CYAN}{Colors.BOLD}Reusing cached result for: {' '.join(command)}{Colors.ENDC}")
+            print(f"{Colors.YELLOW}(identical scan ran less than {CACHE_TTL}s ago; set REDEYE_CACHE_TTL=0 to always rescan){Colors.ENDC}")
+            print("-" * 60)
+            print(cached)
+            print("-" * 60)
+            return
+        base_filename = _unique_scan_base(session)
+        # Build a new list so the caller's command is never mutated.
+        command = [*command, '-oN', base_filename + '.nmap', '-oX', base_filename + '.xml']
 
     print(f"\n{Colors.CYAN}{Colors.BOLD}Executing: {' '.join(command)}{Colors.ENDC}")
     print("-" * 60)
     try:
-        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
-        for line in iter(process.stdout.readline, ''):
-            print(line, end='')
-        process.stdout.close()
-        process.wait()
+        if persistent and shutil_which('bash'):
+            run_in_worker(command)
+            print("\n" + "-" * 60)
+            print(f"{Colors.GREEN}{Colors.BOLD}Command finished.{Colors.ENDC}")
+            return
+        # The child writes straight to our terminal; -oN/-oX already keep the
+        # session copy, so the output never needs to pass through Python.
+        sys.stdout.flush()
+        # An absolute executable and close_fds=False let CPython start the child
+        # with posix_spawn() rather than fork()+exec(). Nothing leaks: every fd
+        # Python opens is non-inheritable unless asked otherwise (PEP 446).
+        result = subprocess.run(command, input=stdin_data, executable=shutil_which(command[0]), close_fds=False)
         print("\n" + "-" * 60)
         print(f"{Colors.GREEN}{Colors.BOLD}Command finished.{Colors.ENDC}")
         if session and is_nmap_scan:
-            print(f"{Colors.GREEN}Results saved in: {base_filename}.nmap/.xml{Colors.ENDC}\n")
+            if _discard_empty_scan(base_filename):
+                print(f"{Colors.YELLOW}nmap wrote no results; nothing was saved.{Colors.ENDC}\n")
+            else:
+                print(f"{Colors.GREEN}Results saved in: {base_filename}.nmap/.xml{Colors.ENDC}\n")
+                if result.returncode == 0:
+                    _store_result(base_filename, cache_base)
+
+    except Exception as e:
+        print(f"{Colors.RED}An error occurred: {e}{Colors.ENDC}")
+        if session and is_nmap_scan:
+            _discard_empty_scan(base_filename)
+
+def expand_targets(targets):
+    """
+    Turns targets into the units handed to parallel nmap chunks. Small
+    networks become single hosts; larger ones are split into 256-address
+    blocks instead of being listed host by host, and networks above
+    MAX_PARALLEL_ADDRESSES are skipped. Other targets are kept whole.
+    """
+    units = []
+    for token in targets:
+        try:
+            network = ipaddress.ip_network(token, strict=False)
+        except ValueError:
+            units.append(token)
+            continue
+        if network.num_addresses > MAX_PARALLEL_ADDRESSES:
+            print(f"{Colors.RED}Skipping {token}: {network.num_addresses} addresses is more than the parallel scan limit of {MAX_PARALLEL_ADDRESSES}.{Colors.ENDC}")
+        elif network.num_addresses > 256:
+            units.extend(str(block) for block in network.subnets(new_prefix=network.max_prefixlen - 8))
+        elif network.num_addresses > 1:
+            units.extend(str(ip) for ip in network.hosts())
+        else:
+            units.append(str(network.network_address))
+    return units
+
+def _scan_chunk(command):
+    """Worker entry point: run one nmap chunk quietly. Return (returncode, stderr)."""
+    rc, _, err = _run_cmd_list(command, capture=True)
+    return rc, err
+
+def _iter_host_xml(xml_path):
+    """Yields the serialised <host> elements of an nmap XML file one at a time."""
+    if lxml_etree is not None:
+        for _, elem in lxml_etree.iterparse(xml_path, events=('end',), tag='host'):
+            yield lxml_etree.tostring(elem, encoding='unicode')
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+        return
+    root = None
+    for event, elem in ET.iterparse(xml_path, events=('start', 'end')):
+        if root is None:
+            root = elem
+        elif event == 'end' and elem.tag == 'host':
+            yield ET.tostring(elem, encoding='unicode')
+            root.remove(elem)
+
+_RUNSTATS_HOSTS_RE = re.compile(r'<hosts up="(\d+)" down="(\d+)" total="(\d+)"')
+
+def _runstats_hosts(xml_path):
+    """Returns the (up, down, total) counts from an nmap XML file's <runstats>, or zeros."""
+    with open(xml_path, "rb") as f:
+        f.seek(max(0, os.path.getsize(xml_path) - 4096))
+        found = _RUNSTATS_HOSTS_RE.search(f.read().decode("utf-8", errors="replace"))
+    return tuple(int(n) for n in found.groups()) if found else (0, 0, 0)
+
+def merge_xml_files(xml_paths, output_path):
+    """
+    Concatenate the <host> entries of several nmap XML files into one file.
+    The other files are streamed host by host, so memory stays flat however
+    many chunks there are.
+    """
+    with open(xml_paths[0], "r", encoding="utf-8") as f:
+        head = f.read()
+    # keep <runstats> as the last child, as nmap writes it; splicing the text
+    # also keeps the DOCTYPE and xml-stylesheet PI that xsltproc needs
+    split = head.rfind("<runstats")
+    if split == -1:
+        split = head.rfind("</nmaprun>")
+    if split == -1:
+        split = len(head)
+    # the host counts must cover every chunk, not just the first
+    up, down, total = (sum(counts) for counts in zip(*map(_runstats_hosts, xml_paths)))
+    tail = _RUNSTATS_HOSTS_RE.sub(f'<hosts up="{up}" down="{down}" total="{total}"', head[split:], count=1)
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(head[:split])
+        for path in xml_paths[1:]:
+            for host in _iter_host_xml(path):
+                f.write(host)
+        f.write(tail)
+
+def run_parallel_scan(targets, per_thread, nmap_args, session, procs=None):
+    """
+    Splits the target list into chunks of `per_thread` hosts, scans them with
+    parallel nmap processes and merges the XML results into the session.
+    """
+    if not targets:
+        print(f"{Colors.RED}No targets to scan.{Colors.ENDC}")
+        return
 
+    # reserve the merged scan's name up front so a queued scan started in the
+    # same second cannot take (or overwrite) it
+    base_filename = _unique_scan_base(session)
+    chunk_dir = base_filename + "_chunks"
+    os.makedirs(chunk_dir, exist_ok=True)
+
+    chunks = [targets[i:i + per_thread] for i in range(0, len(targets), per_thread)]
+    procs = max(1, min(procs or os.cpu_count() or 1, len(chunks)))
+    xml_paths = [os.path.join(chunk_dir, f"chunk_{i}.xml") for i in range(len(chunks))]
+    commands = [['nmap'] + nmap_args + ['-oX', path] + chunk for path, chunk in zip(xml_paths, chunks)]
+
+    print(f"\n{Colors.CYAN}{Colors.BOLD}Scanning {len(targets)} hosts in {len(chunks)} chunks with {procs} processes...{Colors.ENDC}")
+    print("-" * 60)
+    try:
+        with ProcessPoolExecutor(max_workers=procs) as pool:
+            for i, (rc, err) in enumerate(pool.map(_scan_chunk, commands)):
+                status = f"{Colors.GREEN}done{Colors.ENDC}" if rc == 0 else f"{Colors.RED}failed (rc={rc}) {err}{Colors.ENDC}"
+                print(f"  Chunk {i+1}/{len(chunks)}: {status}")
+
+        finished = [path for path in xml_paths if os.path.exists(path)]
+        if not finished:
+            print(f"{Colors.RED}No chunk produced XML output; nothing to merge.{Colors.ENDC}")
+            _discard_empty_scan(base_filename)
+            return
+        merged_path = base_filename + ".xml"
+        merge_xml_files(finished, merged_path)
+        shutil.rmtree(chunk_dir, ignore_errors=True)
+        print("-" * 60)
+        print(f"{Colors.GREEN}{Colors.BOLD}Parallel scan finished.{Colors.ENDC}")
+        print(f"{Colors.GREEN}Merged results saved in: {merged_path}{Colors.ENDC}\n")
     except Exception as e:
         print(f"{Colors.RED}An error occurred: {e}{Colors.ENDC}")
+        _discard_empty_scan(base_filename)
+
+def dispatch_scan(command, session, targets, scan_queue=None):
+    """Runs a scan now, or appends it to `scan_queue` when queue mode is on."""
+    if scan_queue is None:
+        run_command(command, session, targets=targets)
+        return
+    key = _cache_key([*command, *targets])
+    if any(job[3] == key for job in scan_queue):
+        print(f"{Colors.YELLOW}An identical scan is already queued.{Colors.ENDC}")
+        return
+    scan_queue.append((command, session, targets, key))
+    print(f"{Colors.GREEN}Queued: {' '.join(command + targets)} ({len(scan_queue)} in queue){Colors.ENDC}")
+
+def _run_queued(job):
+    """Worker entry point: run one queued scan with its output captured. Return the output."""
+    command, session, targets, _ = job
+    with tempfile.TemporaryFile() as log:
+        # Point this worker's stdio (inherited by nmap) at a private file so
+        # parallel scans do not interleave on the terminal.
+        sys.stdout.flush()
+        os.dup2(log.fileno(), 1)
+        os.dup2(log.fileno(), 2)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.close(devnull)
+        run_command(command, session, targets=targets)
+        sys.stdout.flush()
+        log.seek(0)
+        return log.read().decode("utf-8", errors="replace")
+
+def run_scan_queue(scan_queue):
+    """Runs every queued scan concurrently on a small process pool, printing each result as it finishes."""
+    if not scan_queue:
+        print(f"{Colors.YELLOW}The scan queue is empty.{Colors.ENDC}")
+        return
+    jobs = list(scan_queue)
+    scan_queue.clear()
+
+    if not is_root() and any(job[0][0] == 'sudo' for job in jobs):
+        # ask for the password once up front instead of from several workers at a time
+        _run_cmd_list(['sudo', '-v'])
+
+    workers = max(1, min(MAX_QUEUE_WORKERS, os.cpu_count() or 1, len(jobs)))
+    print(f"\n{Colors.CYAN}{Colors.BOLD}Running {len(jobs)} queued scans with {workers} workers...{Colors.ENDC}")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_queued, job) for job in jobs]
+        for future in as_completed(futures):
+            try:
+                print(future.result())
+            except Exception as e:
+                print(f"{Colors.RED}A queued scan failed: {e}{Colors.ENDC}")
+    print(f"{Colors.GREEN}{Colors.BOLD}Scan queue finished.{Colors.ENDC}")
 
 # =============================================================================
 # SESSION MANAGEMENT FUNCTIONS
@@ -449,7 +1013,7 @@ def run_command(command, session=None):
 
 def set_session():
     """Creates a new session or sets an existing one."""
-    session_name = input(f"{Colors.YELLOW}Enter session name (e.g., 'project_x'): {Colors.ENDC}").strip()
+    session_name = ask(f"{Colors.YELLOW}Enter session name (e.g., 'project_x'): {Colors.ENDC}").strip()
     if not session_name:
         print(f"{Colors.RED}Session name cannot be empty.{Colors.ENDC}")
         return None
@@ -463,6 +1027,41 @@ def set_session():
         print(f"{Colors.RED}Failed to create session directory: {e}{Colors.ENDC}")
         return None
 
+def save_target_aliases(session, aliases):
+    """
+    Merges `aliases` (scanned target -> inputs dropped as duplicates) into the
+    session's target_aliases.json, since the dropped names never reach nmap.
+    """
+    if not session or not aliases:
+        return
+    path = os.path.join(SESSIONS_DIR, session, "target_aliases.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        saved = {}
+    for kept, dropped in aliases.items():
+        known = saved.setdefault(kept, [])
+        known.extend(d for d in dropped if d not in known)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(saved, f, indent=2)
+
+# (session_path, extension) -> (directory st_mtime_ns, sorted (name, path) pairs)
+_SESSION_LISTINGS = {}
+
+def scan_session_dir(session_path, extension):
+    """Return sorted (name, full_path) pairs for `extension`, cached until the directory changes."""
+    mtime = os.stat(session_path).st_mtime_ns
+    key = (session_path, extension)
+    cached = _SESSION_LISTINGS.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    with os.scandir(session_path) as it:
+        names = sorted(e.name for e in it if e.name.endswith(extension) and e.is_file(follow_symlinks=False))
+    files = [(name, os.path.join(session_path, name)) for name in names]
+    _SESSION_LISTINGS[key] = (mtime, files)
+    return files
+
 def list_files_in_session(session, extension):
     """Lists files with a specific extension in a session directory."""
     session_path = os.path.join(SESSIONS_DIR, session)
@@ -470,14 +1069,14 @@ def list_files_in_session(session, extension):
         print(f"{Colors.RED}Session directory not found.{Colors.ENDC}")
         return []
     
-    files = sorted([f for f in os.listdir(session_path) if f.endswith(extension)])
+    files = scan_session_dir(session_path, extension)
     if not files:
         print(f"{Colors.YELLOW}No '{extension}' files found in session '{session}'.{Colors.ENDC}")
         return []
     
     print(f"\n{Colors.HEADER}Available '{extension}' files in '{session}':{Colors.ENDC}")
-    for i, f in enumerate(files):
-        print(f"  {i+1}. {f}")
+    for i, (name, _) in enumerate(files):
+        print(f"  {i+1}. {name}")
     return files
 
 # =============================================================================
@@ -496,13 +1095,13 @@ def compare_scans(session):
         return
 
     try:
-        choice1 = int(input(f"{Colors.BOLD}Select the first file (number): {Colors.ENDC}")) - 1
-        choice2 = int(input(f"{Colors.BOLD}Select the second file (number): {Colors.ENDC}")) - 1
+        choice1 = int(ask(f"{Colors.BOLD}Select the first file (number): {Colors.ENDC}")) - 1
+        choice2 = int(ask(f"{Colors.BOLD}Select the second file (number): {Colors.ENDC}")) - 1
 
-        file1_path = os.path.join(SESSIONS_DIR, session, xml_files[choice1])
-        file2_path = os.path.join(SESSIONS_DIR, session, xml_files[choice2])
+        file1_path = xml_files[choice1][1]
+        file2_path = xml_files[choice2][1]
 
-        run_command(['ndiff', file1_path, file2_path])
+        run_command(['ndiff', file1_path, file2_path], persistent=True)
     except (ValueError, IndexError):
         print(f"{Colors.RED}Invalid selection.{Colors.ENDC}")
 
@@ -517,15 +1116,19 @@ def generate_report(session):
         return
     
     try:
-        choice = int(input(f"{Colors.BOLD}Select the XML file to generate a report from: {Colors.ENDC}")) - 1
-        xml_file = xml_files[choice]
-        xml_path = os.path.join(SESSIONS_DIR, session, xml_file)
-        html_path = xml_path.replace('.xml', '.html')
+        choice_str = ask(f"{Colors.BOLD}Select the XML file to generate a report from ('a' for all): {Colors.ENDC}").strip().lower()
+        if choice_str == 'a':
+            generate_all_reports(xml_files)
+            return
+        choice = int(choice_str) - 1
+        xml_path = xml_files[choice][1]
+        html_path = str(Path(xml_path).with_suffix('.html'))
         
         command = ['xsltproc', '-o', html_path, xml_path]
         
         print(f"\n{Colors.CYAN}{Colors.BOLD}Generating HTML report...{Colors.ENDC}")
-        result = subprocess.run(command, capture_output=True, text=True)
+        # -o writes the report itself; only stderr carries diagnostics.
+        result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
         
         if result.returncode == 0:
             print(f"{Colors.GREEN}{Colors.BOLD}Successfully generated HTML report:{Colors.ENDC} {html_path}")
@@ -537,10 +1140,96 @@ def generate_report(session):
     except (ValueError, IndexError):
         print(f"{Colors.RED}Invalid selection.{Colors.ENDC}")
 
+# stylesheet href -> compiled lxml XSLT transform
+_XSLT_CACHE = {}
+
+def _compiled_stylesheet(doc):
+    """Return the compiled XSLT referenced by the document's xml-stylesheet PI."""
+    pis = doc.xpath("/processing-instruction('xml-stylesheet')")
+    href = pis[0].get("href") if pis else None
+    if not href:
+        raise ValueError("no xml-stylesheet reference in scan file")
+    transform = _XSLT_CACHE.get(href)
+    if transform is None:
+        transform = lxml_etree.XSLT(lxml_etree.parse(href))
+        _XSLT_CACHE[href] = transform
+    return transform
+
+def generate_all_reports(xml_files):
+    """Generates HTML reports for the given (name, path) XML scan files."""
+    print(f"\n{Colors.CYAN}{Colors.BOLD}Generating {len(xml_files)} HTML reports...{Colors.ENDC}")
+    failed = 0
+    for xml_file, xml_path in xml_files:
+        html_path = str(Path(xml_path).with_suffix('.html'))
+        if lxml_etree is not None:
+            # Compile once, transform many: no fork/exec or stylesheet re-parse per file.
+            try:
+                doc = lxml_etree.parse(xml_path)
+                html = _compiled_stylesheet(doc)(doc)
+                with open(html_path, "wb") as f:
+                    f.write(bytes(html))
+                print(f"  {Colors.GREEN}{html_path}{Colors.ENDC}")
+            except Exception as e:
+                failed += 1
+                print(f"  {Colors.RED}{xml_file}: {e}{Colors.ENDC}")
+            continue
+        result = subprocess.run(['xsltproc', '-o', html_path, xml_path], stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        if result.returncode == 0:
+            print(f"  {Colors.GREEN}{html_path}{Colors.ENDC}")
+        else:
+            failed += 1
+            print(f"  {Colors.RED}{xml_file}: {result.stderr.strip()}{Colors.ENDC}")
+
+    if failed:
+        print(f"{Colors.YELLOW}{failed} report(s) failed. Hint: Make sure 'xsltproc' is installed and Nmap's XSL file is in its search path.{Colors.ENDC}")
+    else:
+        print(f"{Colors.GREEN}{Colors.BOLD}All HTML reports generated.{Colors.ENDC}")
+
 # =============================================================================
 # MENU AND INTERFACE FUNCTIONS
 # =============================================================================
 
+# Nmap helper bodies, formatted once at import.
+HELP_SECTIONS = {
+    "1": "\n".join([
+        f"{Colors.BLUE}{Colors.BOLD}Host Discovery:{Colors.ENDC}",
+        f"{Colors.CYAN}-sn / -sP{Colors.ENDC} : Ping Scan. Disables port scanning. Best for just discovering which hosts are online.",
+        f"{Colors.CYAN}-sL{Colors.ENDC}      : List Scan. Simply lists targets without scanning them. Good for a quick target overview.",
+        f"{Colors.CYAN}-Pn{Colors.ENDC}      : No Ping. Skips host discovery. Assumes all targets are online. Use if hosts block pings.",
+    ]),
+    "2": "\n".join([
+        f"{Colors.BLUE}{Colors.BOLD}Scan Techniques:{Colors.ENDC}",
+        f"{Colors.CYAN}-sS{Colors.ENDC} : TCP SYN (Stealth) Scan. Fast, stealthy, and the most popular scan type. Requires root.",
+        f"{Colors.CYAN}-sT{Colors.ENDC} : TCP Connect Scan. Slower and more detectable than SYN, but doesn't require root.",
+        f"{Colors.CYAN}-sU{Colors.ENDC} : UDP Scan. Scans for open UDP ports. Very slow. Requires root.",
+    ]),
+    "3": "\n".join([
+        f"{Colors.BLUE}{Colors.BOLD}Port Specification:{Colors.ENDC}",
+        f"{Colors.CYAN}-p <range>{Colors.ENDC} : Scan specific ports. Examples: -p 22, -p 1-1023, -p U:53,T:21-25,80.",
+        f"{Colors.CYAN}-F{Colors.ENDC}         : Fast Scan. Scans the 100 most common ports.",
+    ]),
+    "4": "\n".join([
+        f"{Colors.BLUE}{Colors.BOLD}Service & OS Detection:{Colors.ENDC}",
+        f"{Colors.CYAN}-sV{Colors.ENDC} : Service/Version Detection. Probes open ports to find out the exact service and version running.",
+        f"{Colors.CYAN}-O{Colors.ENDC}  : OS Detection. Tries to determine the target's operating system. Requires root.",
+        f"{Colors.CYAN}-A{Colors.ENDC}  : Aggressive Scan. A shortcut for -O -sV -sC --traceroute.",
+    ]),
+    "5": "\n".join([
+        f"{Colors.BLUE}{Colors.BOLD}Nmap Scripting Engine (NSE):{Colors.ENDC}",
+        f"{Colors.CYAN}-sC{Colors.ENDC} : Default Scripts. Runs the default set of scripts. It's considered safe for the target.",
+        f"{Colors.CYAN}--script <name>{Colors.ENDC} : Runs specific scripts, categories (e.g., 'vuln'), or all scripts.",
+    ]),
+    "6": "\n".join([
+        f"{Colors.BLUE}{Colors.BOLD}Timing and Performance:{Colors.ENDC}",
+        f"{Colors.CYAN}-T<0-5>{Colors.ENDC} : Timing Template. T0 (paranoid) is very slow, T5 (insane) is very fast. T4 is recommended.",
+    ]),
+    "7": "\n".join([
+        f"{Colors.BLUE}{Colors.BOLD}Output Formats:{Colors.ENDC}",
+        f"{Colors.CYAN}-oN <file>{Colors.ENDC} : Normal Output. Saves the output in a standard text file.",
+        f"{Colors.CYAN}-oX <file>{Colors.ENDC} : XML Output. Saves in XML format, which can be parsed by other tools.",
+    ]),
+}
+
 def show_helper():
     """Displays a detailed helper menu for Nmap commands."""
     while True:
@@ -555,39 +1244,12 @@ def show_helper():
         print("0. Back to Main Menu")
         print("-" * 34)
         
-        choice = input(f"{Colors.BOLD}Select a category to learn more: {Colors.ENDC}")
+        choice = ask(f"{Colors.BOLD}Select a category to learn more: {Colors.ENDC}")
 
         print("\n" + "="*60)
-        if choice == '1':
-            print(f"{Colors.BLUE}{Colors.BOLD}Host Discovery:{Colors.ENDC}")
-            print(f"{Colors.CYAN}-sn / -sP{Colors.ENDC} : Ping Scan. Disables port scanning. Best for just discovering which hosts are online.")
-            print(f"{Colors.CYAN}-sL{Colors.ENDC}      : List Scan. Simply lists targets without scanning them. Good for a quick target overview.")
-            print(f"{Colors.CYAN}-Pn{Colors.ENDC}      : No Ping. Skips host discovery. Assumes all targets are online. Use if hosts block pings.")
-        elif choice == '2':
-            print(f"{Colors.BLUE}{Colors.BOLD}Scan Techniques:{Colors.ENDC}")
-            print(f"{Colors.CYAN}-sS{Colors.ENDC} : TCP SYN (Stealth) Scan. Fast, stealthy, and the most popular scan type. Requires root.")
-            print(f"{Colors.CYAN}-sT{Colors.ENDC} : TCP Connect Scan. Slower and more detectable than SYN, but doesn't require root.")
-            print(f"{Colors.CYAN}-sU{Colors.ENDC} : UDP Scan. Scans for open UDP ports. Very slow. Requires root.")
-        elif choice == '3':
-            print(f"{Colors.BLUE}{Colors.BOLD}Port Specification:{Colors.ENDC}")
-            print(f"{Colors.CYAN}-p <range>{Colors.ENDC} : Scan specific ports. Examples: -p 22, -p 1-1023, -p U:53,T:21-25,80.")
-            print(f"{Colors.CYAN}-F{Colors.ENDC}         : Fast Scan. Scans the 100 most common ports.")
-        elif choice == '4':
-            print(f"{Colors.BLUE}{Colors.BOLD}Service & OS Detection:{Colors.ENDC}")
-            print(f"{Colors.CYAN}-sV{Colors.ENDC} : Service/Version Detection. Probes open ports to find out the exact service and version running.")
-            print(f"{Colors.CYAN}-O{Colors.ENDC}  : OS Detection. Tries to determine the target's operating system. Requires root.")
-            print(f"{Colors.CYAN}-A{Colors.ENDC}  : Aggressive Scan. A shortcut for -O -sV -sC --traceroute.")
-        elif choice == '5':
-            print(f"{Colors.BLUE}{Colors.BOLD}Nmap Scripting Engine (NSE):{Colors.ENDC}")
-            print(f"{Colors.CYAN}-sC{Colors.ENDC} : Default Scripts. Runs the default set of scripts. It's considered safe for the target.")
-            print(f"{Colors.CYAN}--script <name>{Colors.ENDC} : Runs specific scripts, categories (e.g., 'vuln'), or all scripts.")
-        elif choice == '6':
-            print(f"{Colors.BLUE}{Colors.BOLD}Timing and Performance:{Colors.ENDC}")
-            print(f"{Colors.CYAN}-T<0-5>{Colors.ENDC} : Timing Template. T0 (paranoid) is very slow, T5 (insane) is very fast. T4 is recommended.")
-        elif choice == '7':
-            print(f"{Colors.BLUE}{Colors.BOLD}Output Formats:{Colors.ENDC}")
-            print(f"{Colors.CYAN}-oN <file>{Colors.ENDC} : Normal Output. Saves the output in a standard text file.")
-            print(f"{Colors.CYAN}-oX <file>{Colors.ENDC} : XML Output. Saves in XML format, which can be parsed by other tools.")
+        body = HELP_SECTIONS.get(choice)
+        if body is not None:
+            print(body)
         elif choice == '0':
             break
         else:
@@ -598,204 +1260,371 @@ def show_helper():
 # ADVANCED SCANNING FUNCTIONS
 # =============================================================================
 
-def show_advanced_scans(target, ports, session):
-    """Displays and handles the advanced scans menu for a given target."""
+# Advanced scan specs. default_ports is used when no custom ports are set
+# (None: the scan takes no port list); hook runs before the scan and returns
+# extra arguments, or None to cancel.
+AdvancedScan = namedtuple('AdvancedScan', 'needs_sudo flags default_ports hook')
+
+def _ask_zombie():
+    """Hook: asks for the idle scan zombie host; returns None (cancel) if none is given."""
+    zombie = ask(f"{Colors.YELLOW}Enter Zombie IP for Idle Scan: {Colors.ENDC}")
+    return ['-sI', zombie] if zombie else None
+
+def _warn_very_slow():
+    """Hook: warns about the run time; adds no arguments."""
+    print(f"{Colors.RED}{Colors.BOLD}WARNING: This scan is extremely slow and can take many hours.{Colors.ENDC}")
+    return []
+
+def _confirm_exploit():
+    """Hook: asks before running exploit scripts; None cancels the scan."""
+    print(f"{Colors.RED}{Colors.BOLD}WARNING: Running 'exploit' scripts is dangerous and may crash the target.{Colors.ENDC}")
+    if _confirm("Are you sure you want to continue? (yes/no): ", accept=('yes',)):
+        return []
+    return None
+
+def _warn_noisy():
+    """Hook: warns that the scan is noisy; adds no arguments."""
+    print(f"{Colors.RED}{Colors.BOLD}WARNING: This is a very noisy and slow scan.{Colors.ENDC}")
+    return []
+
+ADVANCED_SCANS = {
+    '1': AdvancedScan(True, ('-sn', '-PE', '-PS22,80,443', '-PA80,443', '-PU53', '-T4'), None, None),
+    '2': AdvancedScan(True, ('-Pn', '-sS', '-T4'), ('-p-',), None),
+    '3': AdvancedScan(True, ('-f', '-sS', '-T4'), (), None),
+    '4': AdvancedScan(True, ('-D', 'RND:10', '-sS', '-T4'), (), None),
+    '5': AdvancedScan(True, ('-Pn',), (), _ask_zombie),
+    '6': AdvancedScan(False, ('--script', 'http-enum,http-title,http-vuln*', '-sV', '-T4'), ('-p', '80,443'), None),
+    '7': AdvancedScan(False, ('--script', 'smb-vuln*', '-sV', '-T4'), ('-p', '139,445'), None),
+    '8': AdvancedScan(False, ('--script', 'ftp-anon,ftp-vuln*', '-sV', '-T4'), ('-p', '21'), None),
+    '9': AdvancedScan(False, ('--script', 'mysql-empty-password,mysql-vuln*', '-sV', '-T4'), ('-p', '3306'), None),
+    '10': AdvancedScan(False, ('--script', 'ssl-heartbleed', '-sV'), ('-p', '443'), None),
+    '11': AdvancedScan(False, ('--script', 'http-waf-detect,http-waf-fingerprint', '-T4'), ('-p', '80,443'), None),
+    '12': AdvancedScan(False, ('--script', 'http-slowloris-check', '-T4'), (), None),
+    '13': AdvancedScan(True, ('-sS', '-sU', '-T4'), ('-p', 'T:-,U:1-4000'), _warn_very_slow),
+    '14': AdvancedScan(False, ('-sV', '-sC', '--script', 'not intrusive'), (), None),
+    '15': AdvancedScan(True, ('-sV', '--script', 'exploit', '-T4'), (), _confirm_exploit),
+    '16': AdvancedScan(False, ('-sV', '--script', 'auth', '-T4'), (), None),
+    '17': AdvancedScan(False, ('--traceroute', '--script', 'traceroute-geolocation', '-T4'), ('-p', '80'), None),
+    '18': AdvancedScan(True, ('-A', '-T4'), ('-p-',), _warn_noisy),
+    '19': AdvancedScan(False, ('-sn', '-T4'), None, None),
+    '20': AdvancedScan(True, ('-O', '-T4'), ('-p-',), None),
+    # 6-12 fused into one nmap run: one NSE start-up, one discovery and port-scan phase
+    '22': AdvancedScan(False, ('--script', 'http-enum,http-title,http-vuln*,smb-vuln*,ftp-anon,ftp-vuln*,'
+                                           'mysql-empty-password,mysql-vuln*,ssl-heartbleed,http-waf-detect,'
+                                           'http-waf-fingerprint,http-slowloris-check', '-sV', '-T4'),
+                       ('-p', '21,80,139,443,445,3306'), None),
+}
+
+# full port scans whose `-p-` is narrowed to masscan's open ports when possible
+MASSCAN_PREFILTER = {'2', '13', '18', '20'}
+
+def _narrow_ports(command, open_ports):
+    """Replaces the all-TCP-ports selection in `command` with `open_ports`."""
+    narrowed = []
+    for arg in command:
+        if arg == '-p-':
+            narrowed += ['-p', open_ports]
+        else:
+            narrowed.append(arg.replace('T:-', 'T:' + open_ports))
+    return narrowed
+
+# full argv prefix of each advanced scan, tokenised once at import
+_ADVANCED_ARGV = {
+    choice: (('sudo', 'nmap') if spec.needs_sudo else ('nmap',)) + spec.flags
+    for choice, spec in ADVANCED_SCANS.items()
+}
+
+def build_advanced_command(choice, ports):
+    """Returns the nmap argv (without targets) for an advanced scan, or None if cancelled."""
+    spec = ADVANCED_SCANS[choice]
+    extra = spec.hook() if spec.hook else []
+    if extra is None:
+        return None
+    if spec.default_ports is None:
+        port_args = ()
+    else:
+        port_args = ('-p', ports) if ports else spec.default_ports
+    return [*_ADVANCED_ARGV[choice], *extra, *port_args]
+
+# Colored status lines of the menus, built once; `{}` is filled per paint.
+_STATIC = {
+    'menu_header': f"\n{Colors.HEADER}{Colors.BOLD}--- RedEye Nmap Scanner Menu ---{Colors.ENDC}\n",
+    'session_on': f"{Colors.CYAN}{Colors.BOLD}Active Session: {{}}{Colors.ENDC}\n",
+    'session_off': f"{Colors.YELLOW}{Colors.BOLD}No Active Session (scans will not be saved){Colors.ENDC}\n",
+    'target_on': f"{Colors.GREEN}{Colors.BOLD}Current Target: {{}}{Colors.ENDC}\n",
+    'target_off': f"{Colors.YELLOW}{Colors.BOLD}No Target Set{Colors.ENDC}\n",
+    'ports_on': f"{Colors.GREEN}{Colors.BOLD}Custom Ports: {{}}{Colors.ENDC}\n",
+    'ports_off': f"{Colors.YELLOW}{Colors.BOLD}Ports: Default{Colors.ENDC}\n",
+    'queue_on': f"{Colors.CYAN}{Colors.BOLD}Queue Mode ON: scans are queued ({{}} waiting){Colors.ENDC}\n",
+    'queue_toggle': "Q.  Toggle Queue Mode (currently {})\n",
+    'queue_run': "R.  Run Queued Scans in Parallel ({} queued)\n",
+    'adv_header': f"\n{Colors.HEADER}{Colors.BOLD}--- Advanced Scans Menu (Target: {{}}) ---{Colors.ENDC}\n",
+    'adv_ports': f"{Colors.GREEN}{Colors.BOLD}Using Custom Ports: {{}}{Colors.ENDC}\n",
+}
+
+# Static menu bodies, built once at import; only the headers vary per call.
+_ADV_MENU_STATIC = "\n".join([
+    f"{Colors.YELLOW}--- Firewall/IDS Evasion & Discovery ---{Colors.ENDC}",
+    "1.  Aggressive Discovery (All Ping Types)",
+    "2.  Full Port Scan (No Ping)",
+    "3.  Firewall Evasion (Fragment Packets)",
+    "4.  Firewall Evasion (Decoy Scan)",
+    "5.  Idle Scan (Ultimate Stealth - requires zombie host)",
+    f"{Colors.YELLOW}--- Vulnerability & Service Specific Scans ---{Colors.ENDC}",
+    "6.  Comprehensive Web Server Scan",
+    "7.  SMB Vulnerability Scan (e.g., EternalBlue)",
+    "8.  FTP Vulnerability Scan",
+    "9.  MySQL Vulnerability Scan",
+    "10. Heartbleed SSL Vulnerability Check",
+    "11. Detect Web Application Firewall (WAF)",
+    "12. Slowloris DoS Vulnerability Check",
+    "22. All Service Vuln Sweeps (6-12 in a single nmap run)",
+    f"{Colors.YELLOW}--- Deep & Aggressive Scans ---{Colors.ENDC}",
+    "13. Full TCP & UDP Scan (Extremely Slow)",
+    "14. Safe Script Scan (Non-intrusive)",
+    f"{Colors.RED}15. Exploit Script Scan (Potentially Dangerous){Colors.ENDC}",
+    "16. Brute Force Scripts (Auth Category)",
+    "17. Traceroute & Geo-location",
+    "18. Aggressive All Ports Scan (-A -p-)",
+    "19. Full Network Sweep (Ping Only)",
+    "20. Scan for ALL TCP ports with OS detection",
+    f"{Colors.YELLOW}--- Multi-Target ---{Colors.ENDC}",
+    "21. Parallel Multi-Target Scan (splits hosts across processes)",
+    "0.  Back to Main Menu",
+    "-" * 50,
+]) + "\n"
+
+def show_advanced_scans(targets, ports, session, scan_queue=None):
+    """Displays and handles the advanced scans menu for the given targets."""
     while True:
-        print(f"\n{Colors.HEADER}{Colors.BOLD}--- Advanced Scans Menu (Target: {target}) ---{Colors.ENDC}")
+        header = _STATIC['adv_header'].format(', '.join(targets))
         if ports:
-            print(f"{Colors.GREEN}{Colors.BOLD}Using Custom Ports: {ports}{Colors.ENDC}")
-        print(f"{Colors.YELLOW}--- Firewall/IDS Evasion & Discovery ---{Colors.ENDC}")
-        print("1.  Aggressive Discovery (All Ping Types)")
-        print("2.  Full Port Scan (No Ping)")
-        print("3.  Firewall Evasion (Fragment Packets)")
-        print("4.  Firewall Evasion (Decoy Scan)")
-        print("5.  Idle Scan (Ultimate Stealth - requires zombie host)")
-        print(f"{Colors.YELLOW}--- Vulnerability & Service Specific Scans ---{Colors.ENDC}")
-        print("6.  Comprehensive Web Server Scan")
-        print("7.  SMB Vulnerability Scan (e.g., EternalBlue)")
-        print("8.  FTP Vulnerability Scan")
-        print("9.  MySQL Vulnerability Scan")
-        print("10. Heartbleed SSL Vulnerability Check")
-        print("11. Detect Web Application Firewall (WAF)")
-        print("12. Slowloris DoS Vulnerability Check")
-        print(f"{Colors.YELLOW}--- Deep & Aggressive Scans ---{Colors.ENDC}")
-        print("13. Full TCP & UDP Scan (Extremely Slow)")
-        print("14. Safe Script Scan (Non-intrusive)")
-        print(f"{Colors.RED}15. Exploit Script Scan (Potentially Dangerous){Colors.ENDC}")
-        print("16. Brute Force Scripts (Auth Category)")
-        print("17. Traceroute & Geo-location")
-        print("18. Aggressive All Ports Scan (-A -p-)")
-        print("19. Full Network Sweep (Ping Only)")
-        print("20. Scan for ALL TCP ports with OS detection")
-        print("0.  Back to Main Menu")
-        print("-" * 50)
-
-        choice = input(f"{Colors.BOLD}Select an advanced scan: {Colors.ENDC}")
+            header += _STATIC['adv_ports'].format(ports)
+        sys.stdout.write(header + _ADV_MENU_STATIC)
+        sys.stdout.flush()
+        choice = ask(f"{Colors.BOLD}Select an advanced scan: {Colors.ENDC}")
         command_list = None
         
         port_args = ['-p', ports] if ports else []
 
-        if choice == '1':
-            command_list = ['sudo', 'nmap', '-sn', '-PE', '-PS22,80,443', '-PA80,443', '-PU53', '-T4', target]
-        elif choice == '2':
-            command_list = ['sudo', 'nmap', '-Pn', '-sS', '-T4'] + (port_args if ports else ['-p-']) + [target]
-        elif choice == '3':
-            command_list = ['sudo', 'nmap', '-f', '-sS', '-T4'] + port_args + [target]
-        elif choice == '4':
-            command_list = ['sudo', 'nmap', '-D', 'RND:10', '-sS', '-T4'] + port_args + [target]
-        elif choice == '5':
-            zombie = input(f"{Colors.YELLOW}Enter Zombie IP for Idle Scan: {Colors.ENDC}")
-            if zombie:
-                command_list = ['sudo', 'nmap', '-Pn', '-sI', zombie] + port_args + [target]
-        elif choice == '6':
-            command_list = ['nmap', '--script', 'http-enum,http-title,http-vuln*', '-sV', '-T4'] + (port_args if ports else ['-p', '80,443']) + [target]
-        elif choice == '7':
-            command_list = ['nmap', '--script', 'smb-vuln*', '-sV', '-T4'] + (port_args if ports else ['-p', '139,445']) + [target]
-        elif choice == '8':
-            command_list = ['nmap', '--script', 'ftp-anon,ftp-vuln*', '-sV', '-T4'] + (port_args if ports else ['-p', '21']) + [target]
-        elif choice == '9':
-            command_list = ['nmap', '--script', 'mysql-empty-password,mysql-vuln*', '-sV', '-T4'] + (port_args if ports else ['-p', '3306']) + [target]
-        elif choice == '10':
-            command_list = ['nmap', '--script', 'ssl-heartbleed', '-sV'] + (port_args if ports else ['-p', '443']) + [target]
-        elif choice == '11':
-            command_list = ['nmap', '--script', 'http-waf-detect,http-waf-fingerprint', '-T4'] + (port_args if ports else ['-p', '80,443']) + [target]
-        elif choice == '12':
-            command_list = ['nmap', '--script', 'http-slowloris-check', '-T4'] + port_args + [target]
-        elif choice == '13':
-            print(f"{Colors.RED}{Colors.BOLD}WARNING: This scan is extremely slow and can take many hours.{Colors.ENDC}")
-            command_list = ['sudo', 'nmap', '-sS', '-sU', '-T4'] + (port_args if ports else ['-p', 'T:-,U:1-4000']) + [target]
-        elif choice == '14':
-            command_list = ['nmap', '-sV', '-sC', '--script', '"not intrusive"'] + port_args + [target]
-        elif choice == '15':
-            print(f"{Colors.RED}{Colors.BOLD}WARNING: Running 'exploit' scripts is dangerous and may crash the target.{Colors.ENDC}")
-            if input("Are you sure you want to continue? (yes/no): ").lower() == 'yes':
-                command_list = ['sudo', 'nmap', '-sV', '--script', 'exploit', '-T4'] + port_args + [target]
-        elif choice == '16':
-            command_list = ['nmap', '-sV', '--script', 'auth', '-T4'] + port_args + [target]
-        elif choice == '17':
-            command_list = ['nmap', '--traceroute', '--script', 'traceroute-geolocation', '-T4'] + (port_args if ports else ['-p', '80']) + [target]
-        elif choice == '18':
-            print(f"{Colors.RED}{Colors.BOLD}WARNING: This is a very noisy and slow scan.{Colors.ENDC}")
-            command_list = ['sudo', 'nmap', '-A', '-p-', '-T4'] + port_args + [target] # port_args is redundant but harmless
-        elif choice == '19':
-            command_list = ['nmap', '-sn', '-T4', target]
-        elif choice == '20':
-            command_list = ['sudo', 'nmap', '-O', '-T4'] + (port_args if ports else ['-p-']) + [target]
+        if choice in ADVANCED_SCANS:
+            command_list = build_advanced_command(choice, ports)
+            if command_list and choice in MASSCAN_PREFILTER and not ports:
+                open_ports = _fast_port_discovery(targets, session)
+                if open_ports:
+                    command_list = _narrow_ports(command_list, open_ports)
+        elif choice == '21':
+            if not session:
+                print(f"\n{Colors.RED}Please set a session first (Option 8).{Colors.ENDC}")
+                continue
+            try:
+                procs = int(ask(f"{Colors.YELLOW}Number of parallel processes (--procs) [{os.cpu_count() or 1}]: {Colors.ENDC}") or os.cpu_count() or 1)
+                per_thread = int(ask(f"{Colors.YELLOW}Hosts or /24 blocks per chunk (--chunk) [16]: {Colors.ENDC}") or 16)
+            except ValueError:
+                print(f"{Colors.RED}Invalid number.{Colors.ENDC}")
+                continue
+            nmap_args = shlex.split(ask(f"{Colors.YELLOW}Nmap options [-sV -T4]: {Colors.ENDC}") or "-sV -T4")
+            run_parallel_scan(expand_targets(targets), max(1, per_thread), nmap_args + port_args, session, procs)
         elif choice == '0':
             break
         else:
             print(f"{Colors.RED}Invalid choice.{Colors.ENDC}")
 
         if command_list:
-            run_command(command_list, session)
-
-def show_menu(target, ports, session):
+            dispatch_scan(command_list, session, targets, scan_queue)
+
+_MAIN_MENU_STATIC = "\n".join([
+    "-" * 34,
+    "--- Target & Port Management ---",
+    "1.  Set / Change Target",
+    "2.  Set / Unset Custom Ports (Optional)",
+    "\n--- Basic Scans ---",
+    "3.  Ping Scan (Host Discovery only)",
+    "4.  Intense Scan (-A -T4)",
+    "5.  Fast Scan (Top 100 ports)",
+    "6.  Default Scripts Scan (-sC)",
+    "7.  Vulnerability Scan (General 'vuln' scripts)",
+    "\n--- Session, Reporting & Advanced ---",
+    f"{Colors.CYAN}8.  Set / Create Scan Session{Colors.ENDC}",
+    f"{Colors.CYAN}9.  Compare Two Scans (Diff){Colors.ENDC}",
+    f"{Colors.CYAN}10. Generate HTML Report{Colors.ENDC}",
+    f"{Colors.CYAN}11. Advanced Scans Menu{Colors.ENDC}",
+    "\n--- Other Options ---",
+    "12. Custom Nmap Command",
+    f"{Colors.GREEN}13. Nmap Command Helper{Colors.ENDC}",
+]) + "\n"
+_MAIN_MENU_FOOTER = "0.  Exit\n" + "-" * 34 + "\n"
+
+def show_menu(targets, ports, session, queue_mode=False, queued=0):
     """Displays the main menu of the scanner, showing the current state."""
-    print(f"\n{Colors.HEADER}{Colors.BOLD}--- RedEye Nmap Scanner Menu ---{Colors.ENDC}")
-    if session: print(f"{Colors.CYAN}{Colors.BOLD}Active Session: {session}{Colors.ENDC}")
-    else: print(f"{Colors.YELLOW}{Colors.BOLD}No Active Session (scans will not be saved){Colors.ENDC}")
-    if target: print(f"{Colors.GREEN}{Colors.BOLD}Current Target: {target}{Colors.ENDC}")
-    else: print(f"{Colors.YELLOW}{Colors.BOLD}No Target Set{Colors.ENDC}")
-    if ports: print(f"{Colors.GREEN}{Colors.BOLD}Custom Ports: {ports}{Colors.ENDC}")
-    else: print(f"{Colors.YELLOW}{Colors.BOLD}Ports: Default{Colors.ENDC}")
-    
-    print("-" * 34)
-    print("--- Target & Port Management ---")
-    print("1.  Set / Change Target")
-    print("2.  Set / Unset Custom Ports (Optional)")
+    lines = [
+        _STATIC['menu_header'],
+        _STATIC['session_on'].format(session) if session else _STATIC['session_off'],
+        _STATIC['target_on'].format(', '.join(targets)) if targets else _STATIC['target_off'],
+        _STATIC['ports_on'].format(ports) if ports else _STATIC['ports_off'],
+    ]
+    if queue_mode: lines.append(_STATIC['queue_on'].format(queued))
     
-    print("\n--- Basic Scans ---")
-    print("3.  Ping Scan (Host Discovery only)")
-    print("4.  Intense Scan (-A -T4)")
-    print("5.  Fast Scan (Top 100 ports)")
-    print("6.  Default Scripts Scan (-sC)")
-    print("7.  Vulnerability Scan (General 'vuln' scripts)")
-
-    print("\n--- Session, Reporting & Advanced ---")
-    print(f"{Colors.CYAN}8.  Set / Create Scan Session{Colors.ENDC}")
-    print(f"{Colors.CYAN}9.  Compare Two Scans (Diff){Colors.ENDC}")
-    print(f"{Colors.CYAN}10. Generate HTML Report{Colors.ENDC}")
-    print(f"{Colors.CYAN}11. Advanced Scans Menu{Colors.ENDC}")
-
-    print("\n--- Other Options ---")
-    print("12. Custom Nmap Command")
-    print(f"{Colors.GREEN}13. Nmap Command Helper{Colors.ENDC}")
-    print("0.  Exit")
-    print("-" * 34)
+    lines.append(_MAIN_MENU_STATIC)
+    lines.append(_STATIC['queue_toggle'].format('ON' if queue_mode else 'OFF'))
+    lines.append(_STATIC['queue_run'].format(queued))
+    lines.append(_MAIN_MENU_FOOTER)
+    sys.stdout.write("".join(lines))
+    sys.stdout.flush()
 
 # =============================================================================
 # MAIN APPLICATION FUNCTION
 # =============================================================================
 
+# basic scan choice -> (nmap argv, whether custom ports apply)
+BASIC_SCANS = {
+    '3': (('nmap', '-sn'), False),
+    '4': (('nmap', '-A', '-T4'), True),
+    '5': (('nmap', '-F', '-T4'), True),
+    '6': (('nmap', '-sC'), True),
+    '7': (('nmap', '--script', 'vuln', '-sV'), True),
+}
+
+def _set_targets(state):
+    """Option 1: reads, validates and deduplicates the target list."""
+    targets = parse_targets(ask(f"{Colors.YELLOW}Enter target IP(s), domain(s) or a targets file: {Colors.ENDC}"))
+    if not targets:
+        print(f"{Colors.RED}Target cannot be empty.{Colors.ENDC}")
+        state['targets'], state['aliases'] = None, {}
+        return
+    invalid = [t for t in targets if not valid_target(t)]
+    if invalid:
+        print(f"{Colors.RED}Ignoring invalid target(s): {', '.join(invalid)}{Colors.ENDC}")
+        targets = [t for t in targets if t not in invalid]
+        if not targets:
+            state['targets'], state['aliases'] = None, {}
+            return
+    state['targets'], state['aliases'] = normalize_targets(targets)
+    for kept, dropped in state['aliases'].items():
+        print(f"{Colors.YELLOW}Skipping {', '.join(dropped)}: same address as {kept}.{Colors.ENDC}")
+    save_target_aliases(state['session'], state['aliases'])
+
+def _set_ports(state):
+    """Option 2: sets or clears the custom port list."""
+    ports_in = ask(f"{Colors.YELLOW}Enter custom ports (or blank to clear): {Colors.ENDC}").strip()
+    if not ports_in:
+        state['ports'] = None
+        return
+    ports = normalize_ports(ports_in)
+    if ports is None:
+        print(f"{Colors.RED}Invalid port list '{ports_in}'. Use e.g. 22,80,443 or 1-1000 or T:80,U:53.{Colors.ENDC}")
+        return
+    state['ports'] = ports
+
+def _set_session(state):
+    """Option 8: activates a session and records pending target aliases in it."""
+    state['session'] = set_session()
+    save_target_aliases(state['session'], state['aliases'])
+
+def _active_queue(state):
+    """Returns the scan queue while queue mode is on, else None."""
+    return state['queue'] if state['queue_mode'] else None
+
+def _basic_scan(state, choice):
+    """Options 3-7: runs or queues one of the BASIC_SCANS."""
+    argv, uses_ports = BASIC_SCANS[choice]
+    port_args = ('-p', state['ports']) if uses_ports and state['ports'] else ()
+    dispatch_scan([*argv, *port_args], state['session'], state['targets'], _active_queue(state))
+
+def _custom_command(state):
+    """Option 12: runs a user-supplied nmap command."""
+    custom_cmd_str = ask(f"{Colors.YELLOW}Enter full nmap command: {Colors.ENDC}")
+    if custom_cmd_str.lower().strip().startswith("nmap "):
+        run_command(custom_cmd_str.split(), state['session'])
+    else:
+        print(f"{Colors.RED}Invalid command. It must start with 'nmap '.{Colors.ENDC}")
+
+def _toggle_queue(state):
+    """Option Q: switches queue mode on or off."""
+    state['queue_mode'] = not state['queue_mode']
+    print(f"{Colors.GREEN}Queue mode {'enabled: scans are queued until you choose R' if state['queue_mode'] else 'disabled'}.{Colors.ENDC}")
+
+# main menu choice -> handler(state, choice)
+MAIN_HANDLERS = {
+    '1': lambda state, _: _set_targets(state),
+    '2': lambda state, _: _set_ports(state),
+    '8': lambda state, _: _set_session(state),
+    '9': lambda state, _: compare_scans(state['session']),
+    '10': lambda state, _: generate_report(state['session']),
+    '11': lambda state, _: show_advanced_scans(state['targets'], state['ports'], state['session'], _active_queue(state)),
+    '12': lambda state, _: _custom_command(state),
+    '13': lambda state, _: show_helper(),
+    'Q': lambda state, _: _toggle_queue(state),
+    'R': lambda state, _: run_scan_queue(state['queue']),
+}
+MAIN_HANDLERS.update(dict.fromkeys(BASIC_SCANS, _basic_scan))
+
+# choices that need a target to be set first
+NEEDS_TARGET = set(BASIC_SCANS) | {'11'}
+
+MENU_CHOICES = sorted(set(MAIN_HANDLERS) | {'0'}, key=lambda c: (not c.isdigit(), c.zfill(2)))
+
+def _menu_completer(text, index):
+    """readline completer offering the main menu choices."""
+    matches = [c for c in MENU_CHOICES if c.startswith(text.upper())]
+    return matches[index] if index < len(matches) else None
+
 def main():
     """Main function to run the script's menu loop."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    if sys.stdout.isatty():
+        sys.stdout.write('\x1b[2J\x1b[H')
+        sys.stdout.flush()
     show_banner()
     
-    setup_environment() # New dependency check and installation function
+    print(f"{Colors.BOLD}--- Checking Dependencies ---{Colors.ENDC}")
+    if not ensure_tools(interactive=True):
+        print(f"\n{Colors.RED}{Colors.BOLD}One or more dependencies could not be installed. Please install them manually and restart the script.{Colors.ENDC}")
+        sys.exit(1)
+    print(f"{Colors.GREEN}{Colors.BOLD}All dependencies are met. Starting RedEye...{Colors.ENDC}\n")
+    warm_nse_cache()
     
     os.makedirs(SESSIONS_DIR, exist_ok=True)
 
-    current_target = None
-    current_ports = None
-    current_session = None
+    state = {
+        'targets': None,
+        'aliases': {},
+        'ports': None,
+        'session': None,
+        'queue_mode': False,
+        'queue': deque(),
+    }
 
+    if readline is not None:
+        readline.parse_and_bind('tab: complete')
+
+    # the menu is only redrawn after a handler ran; a mistyped choice just re-prompts
+    dirty = True
     while True:
         try:
-            show_menu(current_target, current_ports, current_session)
-            choice = input(f"{Colors.BOLD}Enter your choice: {Colors.ENDC} ").strip()
-
-            scan_choices = ['3', '4', '5', '6', '7', '11']
-
-            if choice == '1':
-                current_target = input(f"{Colors.YELLOW}Enter target IP or domain: {Colors.ENDC}").strip()
-                if not current_target:
-                    print(f"{Colors.RED}Target cannot be empty.{Colors.ENDC}")
-                    current_target = None
-            elif choice == '2':
-                ports_in = input(f"{Colors.YELLOW}Enter custom ports (or blank to clear): {Colors.ENDC}").strip()
-                current_ports = ports_in if ports_in else None
-            elif choice == '8':
-                current_session = set_session()
-            elif choice in scan_choices and not current_target:
-                print(f"\n{Colors.RED}{Colors.BOLD}No target has been set. Please use option '1' first.{Colors.ENDC}")
-            elif choice == '3':
-                run_command(['nmap', '-sn', current_target], current_session)
-            elif choice == '4':
-                port_args = ['-p', current_ports] if current_ports else []
-                run_command(['nmap', '-A', '-T4'] + port_args + [current_target], current_session)
-            elif choice == '5':
-                port_args = ['-p', current_ports] if current_ports else []
-                run_command(['nmap', '-F', '-T4'] + port_args + [current_target], current_session)
-            elif choice == '6':
-                port_args = ['-p', current_ports] if current_ports else []
-                run_command(['nmap', '-sC'] + port_args + [current_target], current_session)
-            elif choice == '7':
-                port_args = ['-p', current_ports] if current_ports else []
-                run_command(['nmap', '--script', 'vuln', '-sV'] + port_args + [current_target], current_session)
-            elif choice == '9':
-                compare_scans(current_session)
-            elif choice == '10':
-                generate_report(current_session)
-            elif choice == '11':
-                show_advanced_scans(current_target, current_ports, current_session)
-            elif choice == '12':
-                 custom_cmd_str = input(f"{Colors.YELLOW}Enter full nmap command: {Colors.ENDC}")
-                 if custom_cmd_str.lower().strip().startswith("nmap "):
-                     run_command(custom_cmd_str.split(), current_session)
-                 else:
-                    print(f"{Colors.RED}Invalid command. It must start with 'nmap '.{Colors.ENDC}")
-            elif choice == '13':
-                show_helper()
-            elif choice == '0':
+            if dirty:
+                show_menu(state['targets'], state['ports'], state['session'], state['queue_mode'], len(state['queue']))
+            dirty = False
+            choice = ask(f"{Colors.BOLD}Enter your choice: {Colors.ENDC} ", _menu_completer).strip().upper()
+
+            handler = MAIN_HANDLERS.get(choice)
+            if choice == '0':
                 print(f"{Colors.GREEN}Exiting RedEye. Goodbye!{Colors.ENDC}")
                 break
-            else:
+            elif handler is None:
                 print(f"{Colors.RED}Invalid choice. Please try again.{Colors.ENDC}")
+            elif choice in NEEDS_TARGET and not state['targets']:
+                print(f"\n{Colors.RED}{Colors.BOLD}No target has been set. Please use option '1' first.{Colors.ENDC}")
+            else:
+                dirty = True
+                handler(state, choice)
         
         except KeyboardInterrupt:
             print(f"\n{Colors.YELLOW}Operation cancelled by user. Exiting RedEye.{Colors.ENDC}")
             sys.exit(0)
+        except EOFError:
+            # end of piped or --batch input
+            print(f"\n{Colors.GREEN}End of input. Exiting RedEye.{Colors.ENDC}")
+            break
         except Exception as e:
             print(f"{Colors.RED}An unexpected error occurred: {e}{Colors.ENDC}")
 
@@ -808,6 +1637,13 @@ if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "--test-deps":
         success = ensure_tools()
         sys.exit(0 if success else 2)
+    elif len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        if len(sys.argv) < 3:
+            print(f"Usage: {sys.argv[0]} --batch \"<answer>;<answer>;...\"", file=sys.stderr)
+            sys.exit(2)
+        # feed a ';'-separated sequence of answers to the prompts, e.g. "1;scanme.nmap.org;5;0"
+        sys.stdin = io.StringIO("\n".join(sys.argv[2].split(';')) + "\n")
+        main()
     else:
         main()
 